@@ -24,7 +24,7 @@ import time
 def ibCallback(caller, msg, **kwargs):
     if caller == "handleMarketDepth":
         print(chr(27) + "[2J")
-        print( ibConn.marketDepthData[1] )
+        print( ibConn.getMarketDepthData(msg.tickerId) )
 
 # initialize ezIBpy
 ibConn = ezibpy.ezIBpy()
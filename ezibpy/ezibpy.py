@@ -19,14 +19,18 @@
 # limitations under the License.
 
 import atexit
-import os
 import time
 import logging
 import sys
+import threading
 
+from collections.abc import Mapping
 from datetime import datetime
+from functools import lru_cache
+from numpy import (
+    abs as np_abs, fromiter as np_fromiter, zeros as np_zeros
+)
 from pandas import DataFrame, concat as pd_concat
-from stat import S_IWRITE
 
 from ib.opt import Connection
 from ib.ext.Contract import Contract
@@ -53,6 +57,93 @@ if sys.version_info < (3, 4):
 createLogger('ezibpy')
 # ---------------------------------------------
 
+@lru_cache(maxsize=None)
+def _resolution_decimals(res):
+    """ number of decimals in price resolution (ie 0.25 => 2) """
+    res = str(res)
+    return len(res.split('.')[1]) if "." in res else None
+
+
+# blank order, copied by createOrder() instead of running
+# Order.__init__'s ~50 default assignments for every order
+_ORDER_TEMPLATE = Order()
+
+
+# error code lookups (checked on every error message)
+_BENIGN_ERROR_CODES = frozenset(dataTypes["BENIGN_ERROR_CODES"])
+_DISCONNECT_ERROR_CODES = frozenset(dataTypes["DISCONNECT_ERROR_CODES"])
+
+_MSG_CURRENT_TIME = dataTypes["MSG_CURRENT_TIME"]
+_MSG_TYPE_OPEN_ORDER = dataTypes["MSG_TYPE_OPEN_ORDER"]
+_MSG_TYPE_OPEN_ORDER_END = dataTypes["MSG_TYPE_OPEN_ORDER_END"]
+_MSG_TYPE_ORDER_STATUS = dataTypes["MSG_TYPE_ORDER_STATUS"]
+
+# tick fields compared by the tick handlers
+_FIELD_BID_PRICE = dataTypes["FIELD_BID_PRICE"]
+_FIELD_ASK_PRICE = dataTypes["FIELD_ASK_PRICE"]
+_FIELD_LAST_PRICE = dataTypes["FIELD_LAST_PRICE"]
+_FIELD_LAST_TIMESTAMP = dataTypes["FIELD_LAST_TIMESTAMP"]
+_FIELD_RTVOLUME = dataTypes["FIELD_RTVOLUME"]
+_FIELD_OPTION_IMPLIED_VOL = dataTypes["FIELD_OPTION_IMPLIED_VOL"]
+
+# tickSize field -> market/options data column
+_TICK_SIZE_COLUMNS = {
+    dataTypes["FIELD_BID_SIZE"]: "bidsize",
+    dataTypes["FIELD_ASK_SIZE"]: "asksize",
+    dataTypes["FIELD_LAST_SIZE"]: "lastsize",
+    dataTypes["FIELD_OPEN_INTEREST"]: "oi",
+    dataTypes["FIELD_VOLUME"]: "volume",
+}
+
+# option tickSize field -> (options data column, contract right)
+_OPTION_TICK_SIZE_COLUMNS = {
+    dataTypes["FIELD_OPTION_CALL_OPEN_INTEREST"]: ("oi", "CALL"),
+    dataTypes["FIELD_OPTION_PUT_OPEN_INTEREST"]: ("oi", "PUT"),
+    dataTypes["FIELD_OPTION_CALL_VOLUME"]: ("volume", "CALL"),
+    dataTypes["FIELD_OPTION_PUT_VOLUME"]: ("volume", "PUT"),
+}
+
+# tickOptionComputation field -> options data column prefix
+_OPTION_COMPUTATION_PREFIXES = {
+    dataTypes["FIELD_BID_OPTION_COMPUTATION"]: "bid_",
+    dataTypes["FIELD_ASK_OPTION_COMPUTATION"]: "ask_",
+    dataTypes["FIELD_LAST_OPTION_COMPUTATION"]: "last_",
+}
+
+# tickOptionComputation values (in msg order: impliedVol, pvDividend,
+# delta, gamma, vega, theta, optPrice) -> options data columns, per prefix
+_OPTION_COMPUTATION_FIELDS = (
+    "imp_vol", "dividend", "delta", "gamma", "vega", "theta", "price")
+_OPTION_COMPUTATION_COLUMNS = {
+    prefix: tuple(prefix + field for field in _OPTION_COMPUTATION_FIELDS)
+    for prefix in ("", "bid_", "ask_", "last_")
+}
+
+
+class _DataFrameView(Mapping):
+    """
+    read-only {tickerId: DataFrame} view over a per-ticker store;
+    frames are built only for the tickerIds actually accessed
+    """
+    def __init__(self, store, build):
+        self._store = store
+        self._build = build  # tickerId -> DataFrame
+
+    def __getitem__(self, tickerId):
+        if tickerId not in self._store:
+            raise KeyError(tickerId)
+        return self._build(tickerId)
+
+    def __iter__(self):
+        # iterate over a snapshot: the reader thread may add tickerIds
+        return iter(tuple(self._store))
+
+    def __len__(self):
+        return len(self._store)
+
+    def __repr__(self):
+        return repr(dict(self))
+
 
 class ezIBpy():
 
@@ -61,11 +152,11 @@ class ezIBpy():
     # -----------------------------------------
     @staticmethod
     def roundClosestValid(val, res=0.01, decimals=None):
+        """ round to closest resolution """
         if val is None:
             return None
-        """ round to closest resolution """
-        if decimals is None and "." in str(res):
-            decimals = len(str(res).split('.')[1])
+        if decimals is None:
+            decimals = _resolution_decimals(res)
 
         return round(round(val / res) * res, decimals)
 
@@ -79,14 +170,22 @@ class ezIBpy():
         self.ibConn    = None
         self.connected = False
 
-        self.time        = 0
+        self._serverTimeSynced = False  # got a server time msg? (see time)
+        self._serverTimeOffset = 0  # server time - local time (secs)
+        self._serverDatetime = (None, None)  # (time, datetime) cache
+        self._tickTimestamp  = (None, None)  # (secs, formatted) cache
+        self._rtvolTimestamp = (None, None)  # (secs, formatted) cache
         self.commission  = 0
         self.orderId     = int(time.time()) - 1553126400  # default
         self.default_account = None
 
         # auto-construct for every contract/order
         self.tickerIds     = {0: "SYMBOL"}
+        self._symbolTickerIds = {"SYMBOL": 0}  # reverse of tickerIds
         self.contracts     = {}
+        self._isOption     = {}  # idx = tickerId (OPT/FOP contract?)
+        self._contractTuples = set()  # contract_to_tuple() of pooled contracts
+        self._contractStrings = {}  # idx = (contract tuple, seperator)
         self.orders        = {}
         self.account_orders= {}
         self.account_symbols_orders= {}
@@ -108,20 +207,33 @@ class ezIBpy():
         self.log = logging.getLogger('ezibpy')  # get logger
         # -------------------------------------
 
-        # holds market data
-        tickDF = DataFrame({
-            "datetime": [0], "bid": [0], "bidsize": [0],
-            "ask": [0], "asksize": [0], "last": [0], "lastsize": [0]
-        })
-        tickDF.set_index('datetime', inplace=True)
-        self.marketData = {0: tickDF}  # idx = tickerId
-
-        # holds orderbook data
-        l2DF = DataFrame(index=range(5), data={
-            "bid": 0, "bidsize": 0,
-            "ask": 0, "asksize": 0
-        })
-        self.marketDepthData = {0: l2DF}  # idx = tickerId
+        # holds market data (latest values only, see getMarketData())
+        self._marketData = {0: {
+            "datetime": 0, "bid": 0, "bidsize": 0,
+            "ask": 0, "asksize": 0, "last": 0, "lastsize": 0
+        }}  # idx = tickerId
+
+        # holds orderbook data (see getMarketDepthData())
+        # rows = book position (max. 10), cols = bid, bidsize, ask, asksize
+        self._marketDepthData = {0: np_zeros((10, 4))}  # idx = tickerId
+        self._marketDepthRows = {}  # requested num_rows, idx = tickerId
+
+        # skip building hot-path callbacks until ibCallback is set/overridden
+        # (a subclass may have assigned self.ibCallback before calling us)
+        self._hasCallback = "_ibCallback" in vars(self) or \
+            type(self).ibCallback is not ezIBpy.ibCallback
+
+        # coalesce tick price/size/generic callbacks (secs, 0 = every tick)
+        self.tickCallbackInterval  = 0
+        self._tickCallbacksFlushed = 0
+        self._pendingTickCallbacks = {}  # idx = (caller, tickerId, field)
+        self._tickCallbacksTimer   = None  # trailing-edge flush
+        self._tickCallbacksLock    = threading.Lock()
+
+        # market data requests pacing (token bucket, 250 requests/second)
+        self._mktDataRequestsRate   = 250
+        self._mktDataRequestsTokens = 250
+        self._mktDataRequestsTime   = 0
 
         # trailing stops
         self.trailingStops = {}
@@ -144,25 +256,24 @@ class ezIBpy():
         #     quantity: ...
         # }
 
-        # holds options data
-        optionsDF = DataFrame({
-            "datetime": [0], "oi": [0], "volume": [0], "underlying": [0], "iv": [0],
-            "bid": [0], "bidsize": [0], "ask": [0], "asksize": [0], "last": [0], "lastsize": [0],
+        # holds options data (latest values only, see getOptionsData())
+        self._optionsData = {0: {
+            "datetime": 0, "oi": 0, "volume": 0, "underlying": 0, "iv": 0,
+            "bid": 0, "bidsize": 0, "ask": 0, "asksize": 0, "last": 0, "lastsize": 0,
             # opt field
-            "price": [0], "dividend": [0], "imp_vol": [0], "delta": [0],
-            "gamma": [0], "vega": [0], "theta": [0],
-            "last_price": [0], "last_dividend": [0], "last_imp_vol": [0], "last_delta": [0],
-            "last_gamma": [0], "last_vega": [0], "last_theta": [0],
-            "bid_price": [0], "bid_dividend": [0], "bid_imp_vol": [0], "bid_delta": [0],
-            "bid_gamma": [0], "bid_vega": [0], "bid_theta": [0],
-            "ask_price": [0], "ask_dividend": [0], "ask_imp_vol": [0], "ask_delta": [0],
-            "ask_gamma": [0], "ask_vega": [0], "ask_theta": [0],
-        })
-        optionsDF.set_index('datetime', inplace=True)
-        self.optionsData = {0: optionsDF}  # idx = tickerId
+            "price": 0, "dividend": 0, "imp_vol": 0, "delta": 0,
+            "gamma": 0, "vega": 0, "theta": 0,
+            "last_price": 0, "last_dividend": 0, "last_imp_vol": 0, "last_delta": 0,
+            "last_gamma": 0, "last_vega": 0, "last_theta": 0,
+            "bid_price": 0, "bid_dividend": 0, "bid_imp_vol": 0, "bid_delta": 0,
+            "bid_gamma": 0, "bid_vega": 0, "bid_theta": 0,
+            "ask_price": 0, "ask_dividend": 0, "ask_imp_vol": 0, "ask_delta": 0,
+            "ask_gamma": 0, "ask_vega": 0, "ask_theta": 0,
+        }}  # idx = tickerId
 
         # historical data contrainer
         self.historicalData = {}  # idx = symbol
+        self._historicalBars = {}  # bars pending download completion
         self.utc_history = False
 
         # register exit
@@ -175,13 +286,48 @@ class ezIBpy():
             "errors": []
         }
 
+        # server events dispatch table (msg.typeName -> handler)
+        self._serverEventHandlers = {
+            "error": self.handleErrorEvents,
+            dataTypes["MSG_CURRENT_TIME"]: self.handleServerTime,
+
+            dataTypes["MSG_TYPE_MKT_DEPTH"]: self.handleMarketDepth,
+            dataTypes["MSG_TYPE_MKT_DEPTH_L2"]: self.handleMarketDepth,
+
+            dataTypes["MSG_TYPE_TICK_STRING"]: self.handleTickString,
+            dataTypes["MSG_TYPE_TICK_PRICE"]: self.handleTickPrice,
+            dataTypes["MSG_TYPE_TICK_GENERIC"]: self.handleTickGeneric,
+            dataTypes["MSG_TYPE_TICK_SIZE"]: self.handleTickSize,
+            dataTypes["MSG_TYPE_TICK_OPTION"]: self.handleTickOptionComputation,
+
+            dataTypes["MSG_TYPE_OPEN_ORDER"]: self.handleOrders,
+            dataTypes["MSG_TYPE_OPEN_ORDER_END"]: self.handleOrders,
+            dataTypes["MSG_TYPE_ORDER_STATUS"]: self.handleOrders,
+
+            dataTypes["MSG_TYPE_HISTORICAL_DATA"]: self.handleHistoricalData,
+            dataTypes["MSG_TYPE_ACCOUNT_UPDATES"]: self.handleAccount,
+            dataTypes["MSG_TYPE_PORTFOLIO_UPDATES"]: self.handlePortfolio,
+            dataTypes["MSG_TYPE_POSITION"]: self.handlePosition,
+
+            dataTypes["MSG_TYPE_NEXT_ORDER_ID"]: lambda msg: self.handleNextValidId(msg.orderId),
+            dataTypes["MSG_CONNECTION_CLOSED"]: self.handleConnectionClosed,
+            dataTypes["MSG_COMMISSION_REPORT"]: self.handleCommissionReport,
+
+            dataTypes["MSG_CONTRACT_DETAILS"]: lambda msg: self.handleContractDetails(msg, end=False),
+            dataTypes["MSG_CONTRACT_DETAILS_END"]: lambda msg: self.handleContractDetails(msg, end=True),
+            dataTypes["MSG_TICK_SNAPSHOT_END"]: lambda msg: self.ibCallback(caller="handleTickSnapshotEnd", msg=msg),
+        }
+
     # -----------------------------------------
     def log_msg(self, title, msg):
-        # log handler msg
+        # log handler msg (skip copying/formatting when not logged)
+        if not self.log.isEnabledFor(logging.INFO):
+            return
+
         logmsg = copy.copy(msg)
         if hasattr(logmsg, "contract"):
             logmsg.contract = self.contractString(logmsg.contract)
-        self.log.info("[" + str(title).upper() + "]: %s", str(logmsg))
+        self.log.info("[%s]: %s", str(title).upper(), logmsg)
 
     # -----------------------------------------
     def connect(self, clientId=0, host="localhost", port=4001, account=None):
@@ -262,13 +408,17 @@ class ezIBpy():
             contract_tuple = self.contract_to_tuple(contract)
             self.createContract(contract_tuple)
 
-        if self.tickerId(contract) not in self.contracts.keys():
+        if self.tickerId(contract) not in self.contracts:
             contract_tuple = self.contract_to_tuple(contract)
             self.createContract(contract_tuple)
         """
 
+        # already in local database?
+        contract_tuple = self.contract_to_tuple(contract)
+        if contract_tuple in self._contractTuples:
+            return
+
         if self.getConId(contract) == 0:
-            contract_tuple = self.contract_to_tuple(contract)
             self.createContract(contract_tuple)
 
     # -----------------------------------------
@@ -278,19 +428,19 @@ class ezIBpy():
         """ logs error messages """
         # https://www.interactivebrokers.com/en/software/api/apiguide/tables/api_message_codes.htm
         if msg.errorCode is not None and msg.errorCode != -1 and \
-                msg.errorCode not in dataTypes["BENIGN_ERROR_CODES"]:
+                msg.errorCode not in _BENIGN_ERROR_CODES:
 
             log = True
 
             # log disconnect errors only once
-            if msg.errorCode in dataTypes["DISCONNECT_ERROR_CODES"]:
+            if msg.errorCode in _DISCONNECT_ERROR_CODES:
                 log = False
                 if msg.errorCode not in self.connection_tracking["errors"]:
                     self.connection_tracking["errors"].append(msg.errorCode)
                     log = True
 
             if log:
-                self.log.error("[#%s] %s" % (msg.errorCode, msg.errorMsg))
+                self.log.error("[#%s] %s", msg.errorCode, msg.errorMsg)
                 self.ibCallback(caller="handleError", msg=msg)
 
     # -----------------------------------------
@@ -300,101 +450,100 @@ class ezIBpy():
         self.log.debug('MSG %s', msg)
         self.handleConnectionState(msg)
 
-        if msg.typeName == "error":
-            self.handleErrorEvents(msg)
-
-        elif msg.typeName == dataTypes["MSG_CURRENT_TIME"]:
-            if self.time < msg.time:
-                self.time = msg.time
-
-        elif (msg.typeName == dataTypes["MSG_TYPE_MKT_DEPTH"] or
-                msg.typeName == dataTypes["MSG_TYPE_MKT_DEPTH_L2"]):
-            self.handleMarketDepth(msg)
-
-        elif msg.typeName == dataTypes["MSG_TYPE_TICK_STRING"]:
-            self.handleTickString(msg)
-
-        elif msg.typeName == dataTypes["MSG_TYPE_TICK_PRICE"]:
-            self.handleTickPrice(msg)
-
-        elif msg.typeName == dataTypes["MSG_TYPE_TICK_GENERIC"]:
-            self.handleTickGeneric(msg)
-
-        elif msg.typeName == dataTypes["MSG_TYPE_TICK_SIZE"]:
-            self.handleTickSize(msg)
-
-        elif msg.typeName == dataTypes["MSG_TYPE_TICK_OPTION"]:
-            self.handleTickOptionComputation(msg)
-
-        elif (msg.typeName == dataTypes["MSG_TYPE_OPEN_ORDER"] or
-                msg.typeName == dataTypes["MSG_TYPE_OPEN_ORDER_END"] or
-                msg.typeName == dataTypes["MSG_TYPE_ORDER_STATUS"]):
-            self.handleOrders(msg)
-
-        elif msg.typeName == dataTypes["MSG_TYPE_HISTORICAL_DATA"]:
-            self.handleHistoricalData(msg)
+        handler = self._serverEventHandlers.get(msg.typeName)
+        if handler is not None:
+            handler(msg)
+        else:
+            # log handler msg
+            self.log_msg("server", msg)
 
-        elif msg.typeName == dataTypes["MSG_TYPE_ACCOUNT_UPDATES"]:
-            self.handleAccount(msg)
+    # -----------------------------------------
+    # generic callback function - can be used externally
+    # -----------------------------------------
+    @property
+    def ibCallback(self):
+        return self._ibCallback
 
-        elif msg.typeName == dataTypes["MSG_TYPE_PORTFOLIO_UPDATES"]:
-            self.handlePortfolio(msg)
+    @ibCallback.setter
+    def ibCallback(self, callback):
+        self._ibCallback = callback
+        self._hasCallback = True
 
-        elif msg.typeName == dataTypes["MSG_TYPE_POSITION"]:
-            self.handlePosition(msg)
+    def _ibCallback(self, caller, msg, **kwargs):
+        pass
 
-        elif msg.typeName == dataTypes["MSG_TYPE_NEXT_ORDER_ID"]:
-            self.handleNextValidId(msg.orderId)
+    # -----------------------------------------
+    def _tickCallback(self, caller, msg, field):
+        """
+        fires tick price/size/generic callbacks. if tickCallbackInterval is set,
+        only the latest msg per caller/tickerId/field is kept and pending
+        callbacks are flushed at most once per interval (a timer flushes
+        whatever is still pending at the end of the interval)
+        """
+        if not self._hasCallback:
+            return
 
-        elif msg.typeName == dataTypes["MSG_CONNECTION_CLOSED"]:
-            self.handleConnectionClosed(msg)
+        if not self.tickCallbackInterval:
+            self.ibCallback(caller=caller, msg=msg)
+            return
 
-        # elif msg.typeName == dataTypes["MSG_TYPE_MANAGED_ACCOUNTS"]:
-        #     self.accountCode = msg.accountsList
+        with self._tickCallbacksLock:
+            self._pendingTickCallbacks[(caller, msg.tickerId, field)] = msg
 
-        elif msg.typeName == dataTypes["MSG_COMMISSION_REPORT"]:
-            self.commission = msg.commissionReport.m_commission
+            wait = self.tickCallbackInterval - (time.time() - self._tickCallbacksFlushed)
+            if wait > 0:
+                if self._tickCallbacksTimer is None:
+                    self._tickCallbacksTimer = threading.Timer(
+                        wait, self._flushTickCallbacks)
+                    self._tickCallbacksTimer.daemon = True
+                    self._tickCallbacksTimer.start()
+                return
 
-        elif msg.typeName == dataTypes["MSG_CONTRACT_DETAILS"]:
-            self.handleContractDetails(msg, end=False)
+        self._flushTickCallbacks()
 
-        elif msg.typeName == dataTypes["MSG_CONTRACT_DETAILS_END"]:
-            self.handleContractDetails(msg, end=True)
+    # -----------------------------------------
+    def _flushTickCallbacks(self):
+        """ fires the pending (coalesced) tick callbacks """
+        with self._tickCallbacksLock:
+            if self._tickCallbacksTimer is not None:
+                self._tickCallbacksTimer.cancel()
+                self._tickCallbacksTimer = None
 
-        elif msg.typeName == dataTypes["MSG_TICK_SNAPSHOT_END"]:
-            self.ibCallback(caller="handleTickSnapshotEnd", msg=msg)
+            if not self._pendingTickCallbacks:
+                return
 
-        else:
-            # log handler msg
-            self.log_msg("server", msg)
+            self._tickCallbacksFlushed = time.time()
+            pending = self._pendingTickCallbacks
+            self._pendingTickCallbacks = {}
 
-    # -----------------------------------------
-    # generic callback function - can be used externally
-    # -----------------------------------------
-    def ibCallback(self, caller, msg, **kwargs):
-        pass
+        for (caller, _, _), msg in pending.items():
+            self.ibCallback(caller=caller, msg=msg)
 
     # -----------------------------------------
     # Start admin handlers
     # -----------------------------------------
     def handleConnectionState(self, msg):
         """:Return: True if IBPy message `msg` indicates the connection is unavailable for any reason, else False."""
-        self.connected = not (msg.typeName == "error" and
-                              msg.errorCode in dataTypes["DISCONNECT_ERROR_CODES"])
+        typeName = msg.typeName
+        tracking = self.connection_tracking
+
+        self.connected = not (typeName == "error" and
+                              msg.errorCode in _DISCONNECT_ERROR_CODES)
 
         if self.connected:
-            self.connection_tracking["errors"] = []
-            self.connection_tracking["disconnected"] = False
+            if tracking["errors"]:
+                tracking["errors"] = []
+            tracking["disconnected"] = False
 
-            if msg.typeName == dataTypes["MSG_CURRENT_TIME"] and not self.connection_tracking["connected"]:
+            if not tracking["connected"] and typeName == _MSG_CURRENT_TIME:
                 self.log.info("[CONNECTION TO IB ESTABLISHED]")
-                self.connection_tracking["connected"] = True
+                tracking["connected"] = True
                 self.ibCallback(caller="handleConnectionOpened", msg="<connectionOpened>")
         else:
-            self.connection_tracking["connected"] = False
+            tracking["connected"] = False
 
-            if not self.connection_tracking["disconnected"]:
-                self.connection_tracking["disconnected"] = True
+            if not tracking["disconnected"]:
+                tracking["disconnected"] = True
                 self.log.info("[CONNECTION TO IB LOST]")
 
     # -----------------------------------------
@@ -406,6 +555,41 @@ class ezIBpy():
         if not self._disconnected_by_user:
             self.reconnect()
 
+    # -----------------------------------------
+    def handleServerTime(self, msg):
+        """ keep the latest server time """
+        self.time = msg.time
+
+    @property
+    def time(self):
+        """
+        current server time (epoch secs), based on the local clock + offset
+        from the last server time message (0 until one is received)
+        """
+        if not self._serverTimeSynced:
+            return 0
+        return int(time.time() + self._serverTimeOffset)
+
+    @time.setter
+    def time(self, value):
+        self._serverTimeOffset = value - time.time()
+        self._serverTimeSynced = True
+
+    # -----------------------------------------
+    def _getServerDatetime(self):
+        """
+        returns current server time as datetime (cached per second),
+        based on the local clock + offset from the last server time message
+        """
+        now = int(time.time() + self._serverTimeOffset)
+        if self._serverDatetime[0] != now:
+            self._serverDatetime = (now, datetime.fromtimestamp(now))
+        return self._serverDatetime[1]
+
+    # -----------------------------------------
+    def handleCommissionReport(self, msg):
+        self.commission = msg.commissionReport.m_commission
+
     # -----------------------------------------
     def handleNextValidId(self, orderId):
         """
@@ -432,8 +616,13 @@ class ezIBpy():
             if len(self.contract_details[msg.reqId]["contracts"]) > 1:
                 self.contract_details[msg.reqId]["m_contractMonth"] = ""
                 # m_summary should hold closest expiration
+                # (expirations are sorted, so match on value, not on position)
+                contracts = self.contract_details[msg.reqId]["contracts"]
                 expirations = self.getExpirations(self.contracts[msg.reqId], expired=0)
-                contract = self.contract_details[msg.reqId]["contracts"][-len(expirations)]
+                contract = contracts[0]
+                if expirations:
+                    contract = next((c for c in contracts
+                                     if int(c.m_expiry) == expirations[0]), contract)
                 self.contract_details[msg.reqId]["m_summary"] = vars(contract)
             else:
                 self.contract_details[msg.reqId]["m_summary"] = vars(
@@ -447,6 +636,9 @@ class ezIBpy():
                 if len(self.contract_details[msg.reqId]["contracts"]) > 1:
                     self.tickerIds[tid] = newString
                     if newString != oldString:
+                        if self._symbolTickerIds.get(oldString) == tid:
+                            del self._symbolTickerIds[oldString]
+                        self._symbolTickerIds.setdefault(newString, tid)
                         if oldString in self._portfolios:
                             self._portfolios[newString] = self._portfolios[oldString]
                         if oldString in self._positions:
@@ -462,14 +654,12 @@ class ezIBpy():
 
         # collect data on all contract details
         # (including those with multiple expiry/strike/sides)
+        # (vars() exposes the object's own __dict__, no copy is made)
         details  = vars(msg.contractDetails)
         contract = details["m_summary"]
 
-        if msg.reqId in self._contract_details:
-            details['contracts'] = self._contract_details[msg.reqId]["contracts"]
-        else:
-            details['contracts'] = []
-
+        pending = self._contract_details.get(msg.reqId)
+        details['contracts'] = pending["contracts"] if pending else []
         details['contracts'].append(contract)
         details['downloaded'] = False
         self._contract_details[msg.reqId] = details
@@ -482,15 +672,16 @@ class ezIBpy():
         contractString = self.contractString(contract)
         tickerId = self.tickerId(contractString)
         self.contracts[tickerId] = contract
+        self._contractTuples.add(self.contract_to_tuple(contract))
+        self._isOption[tickerId] = contract.m_secType in ("OPT", "FOP")
 
         # continue if this is a "multi" contract
         if tickerId == msg.reqId:
             self._contract_details[msg.reqId]["m_summary"] = vars(contract)
         else:
             # print("+++", tickerId, contractString)
-            self.contract_details[tickerId] = details.copy()
-            self.contract_details[tickerId]["m_summary"] = vars(contract)
-            self.contract_details[tickerId]["contracts"] = [contract]
+            self.contract_details[tickerId] = dict(details,
+                m_summary=vars(contract), contracts=[contract])
 
         # fire callback
         self.ibCallback(caller="handleContractDetails", msg=msg)
@@ -517,7 +708,7 @@ class ezIBpy():
             self.log_msg("account", msg)
 
             # new account?
-            if msg.accountName not in self._accounts.keys():
+            if msg.accountName not in self._accounts:
                 self._accounts[msg.accountName] = {}
 
             # set value
@@ -562,7 +753,7 @@ class ezIBpy():
         if account is None:
             if len(self._accounts) > 1:
                 raise ValueError("Must specify account number as multiple accounts exists.")
-            return self._accounts[list(self._accounts.keys())[0]]
+            return self._accounts[next(iter(self._accounts))]
 
         if account in self._accounts:
             return self._accounts[account]
@@ -586,7 +777,7 @@ class ezIBpy():
         self.registerContract(msg.contract)
 
         # new account?
-        if msg.account not in self._positions.keys():
+        if msg.account not in self._positions:
             self._positions[msg.account] = {}
 
         # if msg.pos != 0 or contractString in self.contracts.keys():
@@ -613,7 +804,7 @@ class ezIBpy():
         if account is None:
             if len(self._positions) > 1:
                 raise ValueError("Must specify account number as multiple accounts exists.")
-            return self._positions[list(self._positions.keys())[0]]
+            return self._positions[next(iter(self._positions))]
 
         if account in self._positions:
             return self._positions[account]
@@ -637,7 +828,7 @@ class ezIBpy():
         self.registerContract(msg.contract)
 
         # new account?
-        if msg.accountName not in self._portfolios.keys():
+        if msg.accountName not in self._portfolios:
             self._portfolios[msg.accountName] = {}
 
         self._portfolios[msg.accountName][contractString] = {
@@ -672,7 +863,7 @@ class ezIBpy():
         if account is None:
             if len(self._portfolios) > 1:
                 raise ValueError("Must specify account number as multiple accounts exists.")
-            return self._portfolios[list(self._portfolios.keys())[0]]
+            return self._portfolios[next(iter(self._portfolios))]
 
         if account in self._portfolios:
             return self._portfolios[account]
@@ -692,25 +883,19 @@ class ezIBpy():
         # log handler msg
         self.log_msg("order", msg)
 
-        # get server time
-        self.getServerTime()
-        time.sleep(0.001)
-
         # we need to handle mutiple events for the same order status
         duplicateMessage = False
 
         # open order
-        if msg.typeName == dataTypes["MSG_TYPE_OPEN_ORDER"]:
+        if msg.typeName == _MSG_TYPE_OPEN_ORDER:
             # contract identifier
             contractString = self.contractString(msg.contract)
 
             order_account = None
-            if msg.orderId in self.orders and self.orders[msg.orderId]["status"] == "SENT":
-                order_account = self.orders[msg.orderId]["account"]
-                try:
-                    del self.orders[msg.orderId]
-                except Exception:
-                    pass
+            order = self.orders.get(msg.orderId)
+            if order is not None and order["status"] == "SENT":
+                order_account = order["account"]
+                del self.orders[msg.orderId]
             order_account = self._get_active_account(order_account)
 
             if msg.orderId in self.orders:
@@ -728,14 +913,16 @@ class ezIBpy():
                     "avgFillPrice": 0.,
                     "parentId": 0,
                     "attached": set(),
-                    "time": datetime.fromtimestamp(int(self.time)),
+                    "time": self._getServerDatetime(),
                     "account": order_account
                 }
                 self._assgin_order_to_account(self.orders[msg.orderId])
 
         # order status
-        elif msg.typeName == dataTypes["MSG_TYPE_ORDER_STATUS"]:
-            if msg.orderId in self.orders and self.orders[msg.orderId]['status'] == msg.status.upper():
+        elif msg.typeName == _MSG_TYPE_ORDER_STATUS:
+            status = msg.status.upper()
+            order = self.orders[msg.orderId]
+            if order['status'] == status:
                 duplicateMessage = True
             else:
                 # remove cancelled orphan orders
@@ -744,11 +931,11 @@ class ezIBpy():
                 #     except Exception: pass
                 # # otherwise, update order status
                 # else:
-                self.orders[msg.orderId]['status'] = msg.status.upper()
-                self.orders[msg.orderId]['reason'] = msg.whyHeld
-                self.orders[msg.orderId]['avgFillPrice'] = float(msg.avgFillPrice)
-                self.orders[msg.orderId]['parentId'] = int(msg.parentId)
-                self.orders[msg.orderId]['time'] = datetime.fromtimestamp(int(self.time))
+                order['status'] = status
+                order['reason'] = msg.whyHeld
+                order['avgFillPrice'] = float(msg.avgFillPrice)
+                order['parentId'] = int(msg.parentId)
+                order['time'] = self._getServerDatetime()
 
             # remove from orders? no! (keep log)
             # if msg.status.upper() == 'CANCELLED':
@@ -756,15 +943,12 @@ class ezIBpy():
 
             # attach sub-orders
             # if hasattr(msg, 'parentId'):
-            parentId = self.orders[msg.orderId]['parentId']
+            parentId = order['parentId']
             if parentId > 0 and parentId in self.orders:
-                if 'attached' not in self.orders[parentId]:
-                    self.orders[parentId]['attached'] = set()
-                self.orders[parentId]['attached'].add(msg.orderId)
+                self.orders[parentId].setdefault('attached', set()).add(msg.orderId)
 
             # cancel orphan sub-orders
-            if self.orders[msg.orderId]['status'] == "FILLED":
-                order = self.orders[msg.orderId]
+            if order['status'] == "FILLED":
                 positions = self.getPositions(order['account'])
                 if (positions[order['symbol']] == 0):
                     for orderId in order['attached']:
@@ -772,12 +956,9 @@ class ezIBpy():
 
         # fire callback
         if duplicateMessage is False:
-            # group orders by symbol
-            self.symbol_orders = self.group_orders("symbol")
-            # group orders by accounts->symbol
-            for accountCode in self.accountCodes:
-                self.account_symbols_orders[accountCode] = self.group_orders(
-                    "symbol", accountCode)
+            # group orders by symbol and by accounts->symbol
+            if msg.typeName != _MSG_TYPE_OPEN_ORDER_END:
+                self._group_order(self.orders[msg.orderId])
             self.ibCallback(caller="handleOrders", msg=msg)
 
     # -----------------------------------------
@@ -787,10 +968,31 @@ class ezIBpy():
         if account_key == "":
             return
         # new account?
-        if account_key not in self.account_orders.keys():
+        if account_key not in self.account_orders:
             self.account_orders[account_key] = {}
         self.account_orders[account_key][order['id']] = order
 
+    # -----------------------------------------
+    def _group_order(self, order):
+        # add/update a single order in symbol_orders / account_symbols_orders
+        # (same result as re-running group_orders() after every order event)
+        symbol = order["symbol"]
+        if symbol not in self.symbol_orders:
+            self.symbol_orders[symbol] = {}
+        self.symbol_orders[symbol][order['id']] = order
+
+        for accountCode in self.accountCodes:
+            if accountCode not in self.account_symbols_orders:
+                self.account_symbols_orders[accountCode] = {}
+
+        account_key = order["account"]
+        if account_key in self.account_symbols_orders and \
+                order['id'] in self.account_orders.get(account_key, {}):
+            account_orders = self.account_symbols_orders[account_key]
+            if symbol not in account_orders:
+                account_orders[symbol] = {}
+            account_orders[symbol][order['id']] = order
+
     # -----------------------------------------
     def getOrders(self, account=None):
         if len(self.account_orders) == 0:
@@ -801,7 +1003,7 @@ class ezIBpy():
         if account is None:
             if len(self.account_orders) > 1:
                 raise ValueError("Must specify account number as multiple accounts exists.")
-            return self.account_orders[list(self.account_orders.keys())[0]]
+            return self.account_orders[next(iter(self.account_orders))]
 
         if account == "*":
             return self.orders
@@ -823,7 +1025,7 @@ class ezIBpy():
         for orderId in collection:
             order = collection[orderId]
 
-            if order[by] not in orders.keys():
+            if order[by] not in orders:
                 orders[order[by]] = {}
 
             # try: del order["contract"]
@@ -843,31 +1045,36 @@ class ezIBpy():
         """
 
         # make sure symbol exists
-        if msg.tickerId not in self.marketDepthData.keys():
-            self.marketDepthData[msg.tickerId] = self.marketDepthData[0].copy()
+        book = self._marketDepthData.get(msg.tickerId)
+        if book is None:
+            book = self._marketDepthData[msg.tickerId] = self._marketDepthData[0].copy()
 
         # bid
         if msg.side == 1:
-            self.marketDepthData[msg.tickerId].loc[msg.position, "bid"] = msg.price
-            self.marketDepthData[msg.tickerId].loc[msg.position, "bidsize"] = msg.size
+            book[msg.position, 0:2] = (msg.price, msg.size)
 
         # ask
         elif msg.side == 0:
-            self.marketDepthData[msg.tickerId].loc[msg.position, "ask"] = msg.price
-            self.marketDepthData[msg.tickerId].loc[msg.position, "asksize"] = msg.size
+            book[msg.position, 2:4] = (msg.price, msg.size)
 
-        """
-        # bid/ask spread / vol diff
-        self.marketDepthData[msg.tickerId].loc[msg.position, "spread"] = \
-            self.marketDepthData[msg.tickerId].loc[msg.position, "ask"]-\
-            self.marketDepthData[msg.tickerId].loc[msg.position, "bid"]
-
-        self.marketDepthData[msg.tickerId].loc[msg.position, "spreadsize"] = \
-            self.marketDepthData[msg.tickerId].loc[msg.position, "asksize"]-\
-            self.marketDepthData[msg.tickerId].loc[msg.position, "bidsize"]
-        """
+        if self._hasCallback:
+            self.ibCallback(caller="handleMarketDepth", msg=msg)
+
+    @property
+    def marketDepthData(self):
+        return self.getMarketDepthData()
+
+    def getMarketDepthData(self, tickerId=None):
+        """ returns orderbook as a DataFrame, trimmed to the requested depth
+        (or a read-only mapping of DataFrames, idx = tickerId,
+        if tickerId is None - frames are built on access) """
+        if tickerId is None:
+            return _DataFrameView(self._marketDepthData, self.getMarketDepthData)
 
-        self.ibCallback(caller="handleMarketDepth", msg=msg)
+        rows = self._marketDepthRows.get(tickerId, 10)
+        df = DataFrame(self._marketDepthData[tickerId][:rows],
+                       columns=["bid", "bidsize", "ask", "asksize"])
+        return df.astype({"bidsize": int, "asksize": int})
 
     # -----------------------------------------
     def handleHistoricalData(self, msg):
@@ -877,18 +1084,24 @@ class ezIBpy():
         if msg.date[:8].lower() == 'finished':
             # print(self.historicalData)
 
+            # convert collected bars to DataFrame (once per download)
+            contractString = str(self.tickerSymbol(msg.reqId))
+            bars = DataFrame(self._historicalBars.pop(contractString, []),
+                             columns=["datetime", "O", "H", "L", "C", "V", "OI", "WAP"])
+            bars.set_index('datetime', inplace=True)
+
             if self.utc_history:
-                for sym in self.historicalData:
-                    contractString = str(sym)
-                    self.historicalData[contractString] = local_to_utc(self.historicalData[contractString])
+                bars = local_to_utc(bars)
+
+            if contractString in self.historicalData:
+                bars = pd_concat([self.historicalData[contractString], bars])
+            self.historicalData[contractString] = bars
 
             if self.csv_path is not None:
-                for sym in self.historicalData:
-                    contractString = str(sym)
-                    self.log.info("[HISTORICAL DATA FOR %s DOWNLOADED]" % contractString)
-                    self.historicalData[contractString].to_csv(
-                        self.csv_path + contractString + '.csv'
-                    )
+                self.log.info("[HISTORICAL DATA FOR %s DOWNLOADED]", contractString)
+                self.historicalData[contractString].to_csv(
+                    self.csv_path + contractString + '.csv'
+                )
 
             print('.')
             # fire callback
@@ -903,20 +1116,16 @@ class ezIBpy():
                 ts = datetime.fromtimestamp(int(msg.date))
                 ts = ts.strftime(dataTypes["DATE_TIME_FORMAT_LONG"])
 
-            hist_row = DataFrame(index=['datetime'], data={
-                "datetime": ts, "O": msg.open, "H": msg.high,
-                "L": msg.low, "C": msg.close, "V": msg.volume,
-                "OI": msg.count, "WAP": msg.WAP})
-            hist_row.set_index('datetime', inplace=True)
-
             symbol = self.tickerSymbol(msg.reqId)
-            if symbol not in self.historicalData.keys():
-                self.historicalData[symbol] = hist_row
-            else:
-                self.historicalData[symbol] = self.historicalData[symbol].append(hist_row)
+            if symbol not in self._historicalBars:
+                self._historicalBars[symbol] = []
+
+            self._historicalBars[symbol].append((ts, msg.open, msg.high,
+                msg.low, msg.close, msg.volume, msg.count, msg.WAP))
 
             # fire callback
-            self.ibCallback(caller="handleHistoricalData", msg=msg, completed=False)
+            if self._hasCallback:
+                self.ibCallback(caller="handleHistoricalData", msg=msg, completed=False)
 
     # -----------------------------------------
     def handleTickGeneric(self, msg):
@@ -924,22 +1133,23 @@ class ezIBpy():
         holds latest tick bid/ask/last price
         """
 
-        df2use = self.marketData
-        if self.contracts[msg.tickerId].m_secType in ("OPT", "FOP"):
-            df2use = self.optionsData
+        df2use = self._marketData
+        if self._isOption.get(msg.tickerId):
+            df2use = self._optionsData
 
         # create tick holder for ticker
-        if msg.tickerId not in df2use.keys():
-            df2use[msg.tickerId] = df2use[0].copy()
+        data = df2use.get(msg.tickerId)
+        if data is None:
+            data = df2use[msg.tickerId] = df2use[0].copy()
 
-        if msg.tickType == dataTypes["FIELD_OPTION_IMPLIED_VOL"]:
-            df2use[msg.tickerId]['iv'] = round(float(msg.value), 2)
+        if msg.tickType == _FIELD_OPTION_IMPLIED_VOL:
+            data['iv'] = round(float(msg.value), 2)
 
         # elif msg.tickType == dataTypes["FIELD_OPTION_HISTORICAL_VOL"]:
-        #     df2use[msg.tickerId]['historical_iv'] = round(float(msg.value), 2)
+        #     data['historical_iv'] = round(float(msg.value), 2)
 
         # fire callback
-        self.ibCallback(caller="handleTickGeneric", msg=msg)
+        self._tickCallback("handleTickGeneric", msg, msg.tickType)
 
     # -----------------------------------------
     def handleTickPrice(self, msg):
@@ -952,28 +1162,29 @@ class ezIBpy():
         if msg.price < 0:
             return
 
-        df2use = self.marketData
+        df2use = self._marketData
         canAutoExecute = msg.canAutoExecute == 1
-        if self.contracts[msg.tickerId].m_secType in ("OPT", "FOP"):
-            df2use = self.optionsData
+        if self._isOption.get(msg.tickerId):
+            df2use = self._optionsData
             canAutoExecute = True
 
         # create tick holder for ticker
-        if msg.tickerId not in df2use.keys():
-            df2use[msg.tickerId] = df2use[0].copy()
+        data = df2use.get(msg.tickerId)
+        if data is None:
+            data = df2use[msg.tickerId] = df2use[0].copy()
 
         # bid price
-        if canAutoExecute and msg.field == dataTypes["FIELD_BID_PRICE"]:
-            df2use[msg.tickerId]['bid'] = float(msg.price)
+        if canAutoExecute and msg.field == _FIELD_BID_PRICE:
+            data['bid'] = float(msg.price)
         # ask price
-        elif canAutoExecute and msg.field == dataTypes["FIELD_ASK_PRICE"]:
-            df2use[msg.tickerId]['ask'] = float(msg.price)
+        elif canAutoExecute and msg.field == _FIELD_ASK_PRICE:
+            data['ask'] = float(msg.price)
         # last price
-        elif msg.field == dataTypes["FIELD_LAST_PRICE"]:
-            df2use[msg.tickerId]['last'] = float(msg.price)
+        elif msg.field == _FIELD_LAST_PRICE:
+            data['last'] = float(msg.price)
 
         # fire callback
-        self.ibCallback(caller="handleTickPrice", msg=msg)
+        self._tickCallback("handleTickPrice", msg, msg.field)
 
     # -----------------------------------------
     def handleTickSize(self, msg):
@@ -984,56 +1195,28 @@ class ezIBpy():
         if msg.size < 0:
             return
 
-        df2use = self.marketData
-        if self.contracts[msg.tickerId].m_secType in ("OPT", "FOP"):
-            df2use = self.optionsData
+        df2use = self._marketData
+        if self._isOption.get(msg.tickerId):
+            df2use = self._optionsData
 
         # create tick holder for ticker
-        if msg.tickerId not in df2use.keys():
-            df2use[msg.tickerId] = df2use[0].copy()
-
-        # ---------------------
-        # market data
-        # ---------------------
-        # bid size
-        if msg.field == dataTypes["FIELD_BID_SIZE"]:
-            df2use[msg.tickerId]['bidsize'] = int(msg.size)
-        # ask size
-        elif msg.field == dataTypes["FIELD_ASK_SIZE"]:
-            df2use[msg.tickerId]['asksize'] = int(msg.size)
-        # last size
-        elif msg.field == dataTypes["FIELD_LAST_SIZE"]:
-            df2use[msg.tickerId]['lastsize'] = int(msg.size)
-
-        # ---------------------
-        # options data
-        # ---------------------
-        # open interest
-        elif msg.field == dataTypes["FIELD_OPEN_INTEREST"]:
-            df2use[msg.tickerId]['oi'] = int(msg.size)
-
-        elif msg.field == dataTypes["FIELD_OPTION_CALL_OPEN_INTEREST"] and \
-                self.contracts[msg.tickerId].m_right == "CALL":
-            df2use[msg.tickerId]['oi'] = int(msg.size)
-
-        elif msg.field == dataTypes["FIELD_OPTION_PUT_OPEN_INTEREST"] and \
-                self.contracts[msg.tickerId].m_right == "PUT":
-            df2use[msg.tickerId]['oi'] = int(msg.size)
-
-        # volume
-        elif msg.field == dataTypes["FIELD_VOLUME"]:
-            df2use[msg.tickerId]['volume'] = int(msg.size)
-
-        elif msg.field == dataTypes["FIELD_OPTION_CALL_VOLUME"] and \
-                self.contracts[msg.tickerId].m_right == "CALL":
-            df2use[msg.tickerId]['volume'] = int(msg.size)
-
-        elif msg.field == dataTypes["FIELD_OPTION_PUT_VOLUME"] and \
-                self.contracts[msg.tickerId].m_right == "PUT":
-            df2use[msg.tickerId]['volume'] = int(msg.size)
+        data = df2use.get(msg.tickerId)
+        if data is None:
+            data = df2use[msg.tickerId] = df2use[0].copy()
+
+        # bid/ask/last size, open interest, volume
+        column = _TICK_SIZE_COLUMNS.get(msg.field)
+        if column is not None:
+            data[column] = int(msg.size)
+
+        # options' call/put open interest and volume
+        elif msg.field in _OPTION_TICK_SIZE_COLUMNS:
+            column, right = _OPTION_TICK_SIZE_COLUMNS[msg.field]
+            if self.contracts[msg.tickerId].m_right == right:
+                data[column] = int(msg.size)
 
         # fire callback
-        self.ibCallback(caller="handleTickSize", msg=msg)
+        self._tickCallback("handleTickSize", msg, msg.field)
 
     # -----------------------------------------
     def handleTickString(self, msg):
@@ -1041,64 +1224,80 @@ class ezIBpy():
         holds latest tick bid/ask/last timestamp
         """
 
-        df2use = self.marketData
-        if self.contracts[msg.tickerId].m_secType in ("OPT", "FOP"):
-            df2use = self.optionsData
+        df2use = self._marketData
+        if self._isOption.get(msg.tickerId):
+            df2use = self._optionsData
 
         # create tick holder for ticker
-        if msg.tickerId not in df2use.keys():
-            df2use[msg.tickerId] = df2use[0].copy()
+        data = df2use.get(msg.tickerId)
+        if data is None:
+            data = df2use[msg.tickerId] = df2use[0].copy()
 
         # update timestamp
-        if msg.tickType == dataTypes["FIELD_LAST_TIMESTAMP"]:
-            ts = datetime.fromtimestamp(int(msg.value)) \
-                .strftime(dataTypes["DATE_TIME_FORMAT_LONG_MILLISECS"])
-            df2use[msg.tickerId].index = [ts]
+        if msg.tickType == _FIELD_LAST_TIMESTAMP:
+            # ticks share a second most of the time - format once per second
+            secs = int(msg.value)
+            if self._tickTimestamp[0] != secs:
+                self._tickTimestamp = (secs, datetime.fromtimestamp(secs)
+                    .strftime(dataTypes["DATE_TIME_FORMAT_LONG_MILLISECS"]))
+            data['datetime'] = self._tickTimestamp[1]
             # self.log.debug("[TICK TS]: %s", ts)
 
             # handle trailing stop orders
-            if self.contracts[msg.tickerId].m_secType not in ("OPT", "FOP"):
+            if not self._isOption.get(msg.tickerId):
                 self.triggerTrailingStops(msg.tickerId)
                 self.handleTrailingStops(msg.tickerId)
 
             # fire callback
-            self.ibCallback(caller="handleTickString", msg=msg)
+            if self._hasCallback:
+                self.ibCallback(caller="handleTickString", msg=msg)
+
+        elif not self._hasCallback:
+            # RTVOL/other tick strings are only parsed for the callback
+            return
 
-        elif (msg.tickType == dataTypes["FIELD_RTVOLUME"]):
+        elif msg.tickType == _FIELD_RTVOLUME:
 
             # log handler msg
             # self.log_msg("rtvol", msg)
 
-            tick = dict(dataTypes["RTVOL_TICKS"])
-            (tick['price'], tick['size'], tick['time'], tick['volume'],
-                tick['wap'], tick['single']) = msg.value.split(';')
+            # price;size;time;volume;wap;single
+            values = msg.value.split(';')
 
-            try:
-                tick['last']       = float(tick['price'])
-                tick['lastsize']   = float(tick['size'])
-                tick['volume']     = float(tick['volume'])
-                tick['wap']        = float(tick['wap'])
-                tick['single']     = tick['single'] == 'true'
-                tick['instrument'] = self.tickerSymbol(msg.tickerId)
-
-                # parse time
-                s, ms = divmod(int(tick['time']), 1000)
-                tick['time'] = '{}.{:03d}'.format(
-                    time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(s)), ms)
-
-                # add most recent bid/ask to "tick"
-                tick['bid']     = df2use[msg.tickerId]['bid'][0]
-                tick['bidsize'] = int(df2use[msg.tickerId]['bidsize'][0])
-                tick['ask']     = df2use[msg.tickerId]['ask'][0]
-                tick['asksize'] = int(df2use[msg.tickerId]['asksize'][0])
-
-                # self.log.debug("%s: %s\n%s", tick['time'], self.tickerSymbol(msg.tickerId), tick)
+            # skip malformed and volume-only (no price/size) ticks,
+            # as well as ticks missing any other field parsed below
+            if len(values) != 6 or not all(values[:5]):
+                return
 
-                # fire callback
-                self.ibCallback(caller="handleTickString", msg=msg, tick=tick)
+            price, size, msecs, volume, wap, single = values
+
+            # parse time
+            s, ms = divmod(int(msecs), 1000)
+            if self._rtvolTimestamp[0] != s:
+                self._rtvolTimestamp = (s, time.strftime(
+                    '%Y-%m-%d %H:%M:%S', time.gmtime(s)))
+
+            # build the tick in one go (the RTVOL_TICKS template is only copied)
+            # and add most recent bid/ask to "tick"
+            tick = dict(dataTypes["RTVOL_TICKS"],
+                        price      = price,
+                        size       = size,
+                        time       = '{}.{:03d}'.format(self._rtvolTimestamp[1], ms),
+                        volume     = float(volume),
+                        wap        = float(wap),
+                        single     = single == 'true',
+                        last       = float(price),
+                        lastsize   = float(size),
+                        instrument = self.tickerSymbol(msg.tickerId),
+                        bid        = data['bid'],
+                        bidsize    = data['bidsize'],
+                        ask        = data['ask'],
+                        asksize    = data['asksize'])
+
+            # self.log.debug("%s: %s\n%s", tick['time'], self.tickerSymbol(msg.tickerId), tick)
 
-            except Exception:
-                pass
+            # fire callback
+            self.ibCallback(caller="handleTickString", msg=msg, tick=tick)
 
         else:
             # self.log.info("tickString-%s", msg)
@@ -1114,52 +1313,75 @@ class ezIBpy():
         only option price is kept at the moment
         https://www.interactivebrokers.com/en/software/api/apiguide/java/tickoptioncomputation.htm
         """
-        def calc_generic_val(data, field):
-            last_val = data['last_' + field].values[-1]
-            bid_val  = data['bid_' + field].values[-1]
-            ask_val  = data['ask_' + field].values[-1]
-            bid_ask_val = last_val
-            if bid_val != 0 and ask_val != 0:
+        def calc_generic_val(last_val, bid_val, ask_val):
+            # uncomputed (None) values count as 0
+            last_val = last_val or 0
+            if bid_val and ask_val:
                 bid_ask_val = (bid_val + ask_val) / 2
-            return max([last_val, bid_ask_val])
+                return last_val if last_val > bid_ask_val else bid_ask_val
+            return last_val
 
         def valid_val(val):
             return float(val) if val < 1000000000 else None
 
         # create tick holder for ticker
-        if msg.tickerId not in self.optionsData.keys():
-            self.optionsData[msg.tickerId] = self.optionsData[0].copy()
+        data = self._optionsData.get(msg.tickerId)
+        if data is None:
+            data = self._optionsData[msg.tickerId] = self._optionsData[0].copy()
 
-        col_prepend = ""
-        if msg.field == "FIELD_BID_OPTION_COMPUTATION":
-            col_prepend = "bid_"
-        elif msg.field == "FIELD_ASK_OPTION_COMPUTATION":
-            col_prepend = "ask_"
-        elif msg.field == "FIELD_LAST_OPTION_COMPUTATION":
-            col_prepend = "last_"
+        col_prepend = _OPTION_COMPUTATION_PREFIXES.get(msg.field, "")
 
         # save side
-        self.optionsData[msg.tickerId][col_prepend + 'imp_vol']  = valid_val(msg.impliedVol)
-        self.optionsData[msg.tickerId][col_prepend + 'dividend'] = valid_val(msg.pvDividend)
-        self.optionsData[msg.tickerId][col_prepend + 'delta'] = valid_val(msg.delta)
-        self.optionsData[msg.tickerId][col_prepend + 'gamma'] = valid_val(msg.gamma)
-        self.optionsData[msg.tickerId][col_prepend + 'vega'] = valid_val(msg.vega)
-        self.optionsData[msg.tickerId][col_prepend + 'theta'] = valid_val(msg.theta)
-        self.optionsData[msg.tickerId][col_prepend + 'price'] = valid_val(msg.optPrice)
+        values = (msg.impliedVol, msg.pvDividend, msg.delta, msg.gamma,
+                  msg.vega, msg.theta, msg.optPrice)
+        for column, val in zip(_OPTION_COMPUTATION_COLUMNS[col_prepend], values):
+            data[column] = valid_val(val)
 
         # save generic/mid
-        data = self.optionsData[msg.tickerId]
-        self.optionsData[msg.tickerId]['imp_vol'] = calc_generic_val(data, 'imp_vol')
-        self.optionsData[msg.tickerId]['dividend'] = calc_generic_val(data, 'dividend')
-        self.optionsData[msg.tickerId]['delta'] = calc_generic_val(data, 'delta')
-        self.optionsData[msg.tickerId]['gamma'] = calc_generic_val(data, 'gamma')
-        self.optionsData[msg.tickerId]['vega'] = calc_generic_val(data, 'vega')
-        self.optionsData[msg.tickerId]['theta'] = calc_generic_val(data, 'theta')
-        self.optionsData[msg.tickerId]['price'] = calc_generic_val(data, 'price')
-        self.optionsData[msg.tickerId]['underlying'] = valid_val(msg.undPrice)
+        for field, last_col, bid_col, ask_col in zip(
+                _OPTION_COMPUTATION_FIELDS,
+                _OPTION_COMPUTATION_COLUMNS["last_"],
+                _OPTION_COMPUTATION_COLUMNS["bid_"],
+                _OPTION_COMPUTATION_COLUMNS["ask_"]):
+            data[field] = calc_generic_val(
+                data[last_col], data[bid_col], data[ask_col])
+
+        data['underlying'] = valid_val(msg.undPrice)
 
         # fire callback
-        self.ibCallback(caller="handleTickOptionComputation", msg=msg)
+        if self._hasCallback:
+            self.ibCallback(caller="handleTickOptionComputation", msg=msg)
+
+    # -----------------------------------------
+    @staticmethod
+    def _ticks_to_dataframe(ticks):
+        df = DataFrame([ticks])
+        df.set_index('datetime', inplace=True)
+        return df
+
+    @property
+    def marketData(self):
+        return self.getMarketData()
+
+    def getMarketData(self, tickerId=None):
+        """ returns latest market data as a DataFrame
+        (or a read-only mapping of DataFrames, idx = tickerId,
+        if tickerId is None - frames are built on access) """
+        if tickerId is None:
+            return _DataFrameView(self._marketData, self.getMarketData)
+        return self._ticks_to_dataframe(self._marketData[tickerId])
+
+    @property
+    def optionsData(self):
+        return self.getOptionsData()
+
+    def getOptionsData(self, tickerId=None):
+        """ returns latest options data as a DataFrame
+        (or a read-only mapping of DataFrames, idx = tickerId,
+        if tickerId is None - frames are built on access) """
+        if tickerId is None:
+            return _DataFrameView(self._optionsData, self.getOptionsData)
+        return self._ticks_to_dataframe(self._optionsData[tickerId])
 
     # -----------------------------------------
     # trailing stops
@@ -1243,7 +1465,7 @@ class ezIBpy():
     def modifyStopOrder(self, orderId, parentId, newStop, quantity,
                         transmit=True, stop_limit=False, account=None):
         """ modify stop order """
-        if orderId in self.orders.keys():
+        if orderId in self.orders:
             order = self.createStopOrder(
                 quantity = quantity,
                 parentId = parentId,
@@ -1262,49 +1484,54 @@ class ezIBpy():
         """ software-based trailing stop """
 
         # existing?
-        if tickerId not in self.trailingStops.keys():
+        trailingStop = self.trailingStops.get(tickerId)
+        if trailingStop is None:
             return None
 
         # continue
-        trailingStop   = self.trailingStops[tickerId]
-        price          = self.marketData[tickerId]['last'][0]
+        price          = self._marketData[tickerId]['last']
         symbol         = self.tickerSymbol(tickerId)
         # contract       = self.contracts[tickerId]
         # contractString = self.contractString(contract)
 
         if self.default_account is None:
-            self.default_account = list(self._positions.keys())[0]
+            self.default_account = next(iter(self._positions))
 
         # filled / no positions?
-        if (self._positions[self.default_account][symbol] == 0) | \
-                (self.orders[trailingStop['orderId']]['status'] == "FILLED"):
+        if self._positions[self.default_account][symbol] == 0 or \
+                self.orders[trailingStop['orderId']]['status'] == "FILLED":
             del self.trailingStops[tickerId]
             return None
 
         # continue...
-        newStop  = trailingStop['lastPrice']
-        ticksize = trailingStop['ticksize']
+        lastPrice    = trailingStop['lastPrice']
+        quantity     = trailingStop['quantity']
+        trailAmount  = trailingStop['trailAmount']
+        trailPercent = trailingStop['trailPercent']
+        newStop      = lastPrice
 
         # long
-        if (trailingStop['quantity'] < 0) & (trailingStop['lastPrice'] < price):
-            if abs(trailingStop['trailAmount']) >= 0:
-                newStop = price - abs(trailingStop['trailAmount'])
-            elif trailingStop['trailPercent'] >= 0:
-                newStop = price - (price * (abs(trailingStop['trailPercent']) / 100))
+        if quantity < 0 and lastPrice < price:
+            if abs(trailAmount) >= 0:
+                newStop = price - abs(trailAmount)
+            elif trailPercent >= 0:
+                newStop = price - (price * (abs(trailPercent) / 100))
         # short
-        elif (trailingStop['quantity'] > 0) & (trailingStop['lastPrice'] > price):
-            if abs(trailingStop['trailAmount']) >= 0:
-                newStop = price + abs(trailingStop['trailAmount'])
-            elif trailingStop['trailPercent'] >= 0:
-                newStop = price + (price * (abs(trailingStop['trailPercent']) / 100))
+        elif quantity > 0 and lastPrice > price:
+            if abs(trailAmount) >= 0:
+                newStop = price + abs(trailAmount)
+            elif trailPercent >= 0:
+                newStop = price + (price * (abs(trailPercent) / 100))
 
-        # valid newStop
-        newStop = self.roundClosestValid(newStop, ticksize)
+        # valid newStop (inlined roundClosestValid - runs on every tick)
+        ticksize = trailingStop['ticksize']
+        newStop = round(round(newStop / ticksize) * ticksize,
+                        _resolution_decimals(ticksize))
 
-        # print("\n\n", trailingStop['lastPrice'], newStop, price, "\n\n")
+        # print("\n\n", lastPrice, newStop, price, "\n\n")
 
         # no change?
-        if newStop == trailingStop['lastPrice']:
+        if newStop == lastPrice:
             return None
 
         # submit order
@@ -1316,7 +1543,7 @@ class ezIBpy():
         )
 
         if trailingStopOrderId:
-            self.trailingStops[tickerId]['lastPrice'] = price
+            trailingStop['lastPrice'] = price
 
         return trailingStopOrderId
 
@@ -1326,12 +1553,13 @@ class ezIBpy():
         # print('.')
 
         # get pricing data
-        price  = self.marketData[tickerId]['last'][0]
+        price  = self._marketData[tickerId]['last']
         contract = self.contracts[tickerId]
         symbol = self.tickerSymbol(tickerId)
 
         # abort?
-        if symbol not in self.triggerableTrailingStops.keys():
+        pendingOrder = self.triggerableTrailingStops.get(symbol)
+        if pendingOrder is None:
             return
 
         # # trigger the order (used for debugging)
@@ -1340,9 +1568,17 @@ class ezIBpy():
         #     self.trailch = True
         #     return
 
+        # abort? (checked before extracting the rest of the order data,
+        # as most ticks arrive while the parent order is still pending)
+        parentId    = pendingOrder["parentId"]
+        parentOrder = self.orders.get(parentId)
+        if parentOrder is None:
+            del self.triggerableTrailingStops[symbol]
+            return
+        elif parentOrder["status"] != "FILLED":
+            return
+
         # extract order data
-        pendingOrder  = self.triggerableTrailingStops[symbol]
-        parentId      = pendingOrder["parentId"]
         stopOrderId   = pendingOrder["stopOrderId"]
         targetOrderId = pendingOrder["targetOrderId"]
         triggerPrice  = pendingOrder["triggerPrice"]
@@ -1352,34 +1588,23 @@ class ezIBpy():
         ticksize      = pendingOrder["ticksize"]
         account       = pendingOrder["account"]
 
-        # abort?
-        if parentId not in self.orders.keys():
-            del self.triggerableTrailingStops[symbol]
-            return
-        elif self.orders[parentId]["status"] != "FILLED":
-            return
-
         # print(">>>>>>>", pendingOrder)
         # print(">>>>>>>", parentId)
         # print(">>>>>>>", self.orders)
 
-        print("[TRAIL]", quantity, triggerPrice, price)
+        self.log.debug("[TRAIL]: %s %s %s", quantity, triggerPrice, price)
+
+        # stop is placed above the price for positive quantities (buy stop)
+        # and below it for negative ones
+        side = 1 if quantity > 0 else -1
 
-        if ((quantity > 0) & (triggerPrice >= price)) | (
-            (quantity < 0) & (triggerPrice <= price)):
+        if quantity != 0 and side * (triggerPrice - price) >= 0:
             # print('TRIGGER ***********')
 
-            newStop = price
             if trailAmount > 0:
-                if quantity > 0:
-                    newStop += trailAmount
-                else:
-                    newStop -= trailAmount
+                newStop = price + side * trailAmount
             elif trailPercent > 0:
-                if quantity > 0:
-                    newStop += price * (trailPercent / 100)
-                else:
-                    newStop -= price * (trailPercent / 100)
+                newStop = price + side * price * (trailPercent / 100)
             else:
                 del self.triggerableTrailingStops[symbol]
                 return 0
@@ -1421,12 +1646,15 @@ class ezIBpy():
                 # print(">>> TRAILING STOP TRIGGERED")
                 del self.triggerableTrailingStops[symbol]
 
-                # "delete" target and keep traling only
-                if targetOrderId and targetOrderId in self.orders.keys():
+                # "delete" target and keep traling only: move the (MIT)
+                # target's trigger out of reach - a sell (quantity < 0)
+                # triggers at/above auxPrice, a buy at/below it
+                targetOrder = self.orders.get(targetOrderId, {}).get('order') \
+                    if targetOrderId else None
+                if targetOrder is not None:
                     # self.cancelOrder(targetOrderId)
-                    targetOrder = self.orders[targetOrderId]['order']
-                    targetOrder.m_auxPrice = 0 if quantity < 0 else 1000000
-                    self.placeOrder(contract, order, targetOrderId,
+                    targetOrder.m_auxPrice = 1000000 if quantity < 0 else 0
+                    self.placeOrder(contract, targetOrder, targetOrderId,
                                     targetOrder.m_account)
 
                 # register trailing stop
@@ -1459,13 +1687,13 @@ class ezIBpy():
         if isinstance(symbol, Contract):
             symbol = self.contractString(symbol)
 
-        for tickerId in self.tickerIds:
-            if symbol == self.tickerIds[tickerId]:
-                return tickerId
-        else:
+        tickerId = self._symbolTickerIds.get(symbol)
+        if tickerId is None:
             tickerId = len(self.tickerIds)
             self.tickerIds[tickerId] = symbol
-            return tickerId
+            self._symbolTickerIds[symbol] = tickerId
+
+        return tickerId
 
     # -----------------------------------------
     def tickerSymbol(self, tickerId):
@@ -1479,13 +1707,16 @@ class ezIBpy():
     def contractString(self, contract, seperator="_"):
         """ returns string from contract tuple """
 
-        localSymbol = ""
         contractTuple = contract
-
         if type(contract) != tuple:
-            localSymbol = contract.m_localSymbol
             contractTuple = self.contract_to_tuple(contract)
 
+        # already constructed?
+        cacheKey = (contractTuple, seperator)
+        contractString = self._contractStrings.get(cacheKey)
+        if contractString is not None:
+            return contractString
+
         # build identifier
         try:
             if contractTuple[1] in ("OPT", "FOP"):
@@ -1493,8 +1724,9 @@ class ezIBpy():
                 #     strike = contractTuple[5]
                 # else:
                 #     strike = "{0:.2f}".format(contractTuple[5])
-                strike = '{:0>5d}'.format(int(contractTuple[5])) + \
-                    format(contractTuple[5], '.3f').split('.')[1]
+                # strike as 5 integer + 3 decimal digits (ie 450.5 => 00450500)
+                strike = '{:05d}{:03d}'.format(
+                    *divmod(int(round(contractTuple[5] * 1000)), 1000))
 
                 contractString = (contractTuple[0] + str(contractTuple[4]) +
                                   contractTuple[6][0] + strike, contractTuple[1])
@@ -1518,7 +1750,9 @@ class ezIBpy():
         except Exception:
             contractString = contractTuple[0]
 
-        return contractString.replace(" ", "_").upper()
+        contractString = contractString.replace(" ", "_").upper()
+        self._contractStrings[cacheKey] = contractString
+        return contractString
 
     # -----------------------------------------
     def contractDetails(self, contract_identifier):
@@ -1572,7 +1806,7 @@ class ezIBpy():
         return False
 
     # -----------------------------------------
-    def createContract(self, contractTuple, **kwargs):
+    def createContract(self, contractTuple, requestDetails=True, **kwargs):
         # https://www.interactivebrokers.com/en/software/api/apiguide/java/contract.htm
 
         contractString = self.contractString(contractTuple)
@@ -1606,9 +1840,11 @@ class ezIBpy():
 
         # add contract to pool
         self.contracts[tickerId] = newContract
+        self._contractTuples.add(self.contract_to_tuple(newContract))
+        self._isOption[tickerId] = newContract.m_secType in ("OPT", "FOP")
 
         # request contract details
-        if "comboLegs" not in kwargs:
+        if requestDetails and "comboLegs" not in kwargs:
             try:
                 self.requestContractDetails(newContract)
                 time.sleep(1.5 if self.isMultiContract(newContract) else 0.5)
@@ -1671,6 +1907,7 @@ class ezIBpy():
 
         # delete continuous placeholder
         tickerId = contfut["tickerId"]
+        self._contractTuples.discard(self.contract_to_tuple(self.contracts[tickerId]))
         del self.contracts[tickerId]
         del self.contract_details[tickerId]
 
@@ -1701,11 +1938,36 @@ class ezIBpy():
                 for opt_otype in otype:
                     contract_tuple = (symbol, secType, exchange, currency,
                                       opt_expiry, opt_strike, opt_otype)
-                    contract = self.createContract(contract_tuple)
+                    contract = self.createContract(contract_tuple, requestDetails=False)
                     contracts.append(contract)
 
+        # request all contract details at once (instead of waiting
+        # for each contract's details before creating the next one)
+        try:
+            self._requestContractsDetails(contracts)
+        except KeyboardInterrupt:
+            sys.exit()
+
         return contracts[0] if len(contracts) == 1 else contracts
 
+    # -----------------------------------------
+    def _requestContractsDetails(self, contracts):
+        """ requests details for multiple contracts and waits until
+        they're all downloaded (or createContract's wait time passed) """
+        timeout = 0
+        tickerIds = []
+        for contract in contracts:
+            timeout += 1.5 if self.isMultiContract(contract) else 0.5
+            tickerIds.append(self.tickerId(contract))
+            self.requestContractDetails(contract)
+            time.sleep(0.025)  # stay under IB's 50 msgs/sec pacing limit
+
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if all(tid in self.contract_details for tid in tickerIds):
+                break
+            time.sleep(0.1)
+
     # -----------------------------------------
     def createCashContract(self, symbol, currency="USD", exchange="IDEALPRO"):
         """ Used for FX, etc:
@@ -1730,7 +1992,7 @@ class ezIBpy():
             account=None, **kwargs):
 
         # https://www.interactivebrokers.com/en/software/api/apiguide/java/order.htm
-        order = Order()
+        order = copy.copy(_ORDER_TEMPLATE)
         order.m_clientId = self.clientId
         order.m_action = dataTypes["ORDER_ACTION_BUY"] if quantity > 0 else dataTypes["ORDER_ACTION_SELL"]
         order.m_totalQuantity = abs(int(quantity))
@@ -1890,8 +2152,7 @@ class ezIBpy():
                     account  = self._get_active_account(account)
                 )
 
-        self.requestOrderIds()
-        return self.placeOrder(contract, order, self.orderId + 1)
+        return self.placeOrder(contract, order)
 
     # -----------------------------------------
     def createBracketOrder(self, contract, quantity,
@@ -1933,8 +2194,7 @@ class ezIBpy():
                             account   = account
                         )
 
-            self.requestOrderIds()
-            targetOrderId = self.placeOrder(contract, targetOrder, self.orderId + 1)
+            targetOrderId = self.placeOrder(contract, targetOrder, entryOrderId + 1)
             # print(self.orderId, targetOrderId)
 
         # stop
@@ -1955,8 +2215,7 @@ class ezIBpy():
                             account    = account
                         )
 
-            self.requestOrderIds()
-            stopOrderId = self.placeOrder(contract, stopOrder, self.orderId + 2)
+            stopOrderId = self.placeOrder(contract, stopOrder, entryOrderId + 2)
             # print(self.orderId, stopOrderId)
 
             # triggered trailing stop?
@@ -1989,9 +2248,12 @@ class ezIBpy():
     def placeOrder(self, contract, order, orderId=None, account=None):
         """ Place order on IB TWS """
 
-        # get latest order id before submitting an order
-        self.requestOrderIds()
-        # time.sleep(0.01)
+        # use the next order id (ids are incremented locally, starting
+        # from the nextValidId the server sends upon connect)
+        if orderId is None:
+            self.orderId += 1
+        elif orderId > self.orderId:
+            self.orderId = orderId
 
         # make sure the price confirms to th contract
         ticksize = self.contractDetails(contract)["m_minTick"]
@@ -2015,7 +2277,7 @@ class ezIBpy():
             "reason":   None,
             "avgFillPrice": 0.,
             "parentId": 0,
-            "time": datetime.fromtimestamp(int(self.time)),
+            "time": self._getServerDatetime(),
             "account": None
         }
         if hasattr(order, "m_account"):
@@ -2028,9 +2290,6 @@ class ezIBpy():
     def cancelOrder(self, orderId):
         """ cancel order on IB TWS """
         self.ibConn.cancelOrder(orderId)
-
-        # update order id for next time
-        self.requestOrderIds()
         return orderId
 
     # -----------------------------------------
@@ -2056,6 +2315,18 @@ class ezIBpy():
         self.ibConn.reqIds(numIds)
         time.sleep(0.01)
 
+    # -----------------------------------------
+    def _requested_contracts(self, contracts=None):
+        """
+        returns the requesters' contracts argument as a sequence
+        (all contracts if None, copied as the pool may change meanwhile)
+        """
+        if contracts is None:
+            return tuple(self.contracts.values())
+        if isinstance(contracts, list):
+            return contracts
+        return (contracts,)
+
     # -----------------------------------------
     def requestMarketDepth(self, contracts=None, num_rows=10):
         """
@@ -2066,13 +2337,9 @@ class ezIBpy():
         if num_rows > 10:
             num_rows = 10
 
-        if contracts == None:
-            contracts = list(self.contracts.values())
-        elif not isinstance(contracts, list):
-            contracts = [contracts]
-
-        for contract in contracts:
-            tickerId = self.tickerId(self.contractString(contract))
+        for contract in self._requested_contracts(contracts):
+            tickerId = self.tickerId(contract)
+            self._marketDepthRows[tickerId] = num_rows
             self.ibConn.reqMktDepth(
                 tickerId, contract, num_rows)
 
@@ -2082,13 +2349,8 @@ class ezIBpy():
         Cancel streaming market data for contract
         https://www.interactivebrokers.com/en/software/api/apiguide/java/cancelmktdepth.htm
         """
-        if contracts == None:
-            contracts = list(self.contracts.values())
-        elif not isinstance(contracts, list):
-            contracts = [contracts]
-
-        for contract in contracts:
-            tickerId = self.tickerId(self.contractString(contract))
+        for contract in self._requested_contracts(contracts):
+            tickerId = self.tickerId(contract)
             self.ibConn.cancelMktDepth(tickerId=tickerId)
 
     # -----------------------------------------
@@ -2097,43 +2359,52 @@ class ezIBpy():
         Register to streaming market data updates
         https://www.interactivebrokers.com/en/software/api/apiguide/java/reqmktdata.htm
         """
-        if contracts == None:
-            contracts = list(self.contracts.values())
-        elif not isinstance(contracts, list):
-            contracts = [contracts]
-
-        for contract in contracts:
-            if snapshot:
-                reqType = ""
-            else:
-                reqType = dataTypes["GENERIC_TICKS_RTVOLUME"]
-                if contract.m_secType in ("OPT", "FOP"):
-                    reqType = dataTypes["GENERIC_TICKS_NONE"]
+        # generic ticks to request (options don't support RTVOLUME)
+        reqType = optReqType = ""
+        if not snapshot:
+            reqType = dataTypes["GENERIC_TICKS_RTVOLUME"]
+            optReqType = dataTypes["GENERIC_TICKS_NONE"]
 
+        for contract in self._requested_contracts(contracts):
             # get market data for single contract
             # limit is 250 requests/second
             if not self.isMultiContract(contract):
                 try:
-                    tickerId = self.tickerId(self.contractString(contract))
-                    self.ibConn.reqMktData(tickerId, contract, reqType, snapshot)
-                    time.sleep(0.0042)  # 250 = 1.05s
+                    self._paceMarketDataRequests()
+                    tickerId = self.tickerId(contract)
+                    self.ibConn.reqMktData(tickerId, contract,
+                        optReqType if contract.m_secType in ("OPT", "FOP") else reqType,
+                        snapshot)
                 except KeyboardInterrupt:
                     sys.exit()
 
+    # -----------------------------------------
+    def _paceMarketDataRequests(self):
+        """
+        token bucket for market data requests: requests go out back-to-back
+        and only wait once more than 250 were sent within the last second
+        """
+        now = time.time()
+        tokens = min(self._mktDataRequestsRate, self._mktDataRequestsTokens +
+                     (now - self._mktDataRequestsTime) * self._mktDataRequestsRate)
+
+        if tokens < 1:
+            time.sleep((1 - tokens) / self._mktDataRequestsRate)
+            now = time.time()
+            tokens = 1
+
+        self._mktDataRequestsTokens = tokens - 1
+        self._mktDataRequestsTime = now
+
     # -----------------------------------------
     def cancelMarketData(self, contracts=None):
         """
         Cancel streaming market data for contract
         https://www.interactivebrokers.com/en/software/api/apiguide/java/cancelmktdata.htm
         """
-        if contracts == None:
-            contracts = list(self.contracts.values())
-        elif not isinstance(contracts, list):
-            contracts = [contracts]
-
-        for contract in contracts:
+        for contract in self._requested_contracts(contracts):
             # tickerId = self.tickerId(contract.m_symbol)
-            tickerId = self.tickerId(self.contractString(contract))
+            tickerId = self.tickerId(contract)
             self.ibConn.cancelMktData(tickerId=tickerId)
 
     # -----------------------------------------
@@ -2152,19 +2423,13 @@ class ezIBpy():
         if end_datetime == None:
             end_datetime = time.strftime(dataTypes["DATE_TIME_FORMAT_HISTORY"])
 
-        if contracts == None:
-            contracts = list(self.contracts.values())
-
-        if not isinstance(contracts, list):
-            contracts = [contracts]
-
-        for contract in contracts:
+        for contract in self._requested_contracts(contracts):
             show = str(data).upper()
             if contract.m_secType in ['CASH', 'CFD'] and data == 'TRADES':
                 show = 'MIDPOINT'
 
             # tickerId = self.tickerId(contract.m_symbol)
-            tickerId = self.tickerId(self.contractString(contract))
+            tickerId = self.tickerId(contract)
             self.ibConn.reqHistoricalData(
                 tickerId       = tickerId,
                 contract       = contract,
@@ -2178,14 +2443,9 @@ class ezIBpy():
 
     def cancelHistoricalData(self, contracts=None):
         """ cancel historical data stream """
-        if contracts == None:
-            contracts = list(self.contracts.values())
-        elif not isinstance(contracts, list):
-            contracts = [contracts]
-
-        for contract in contracts:
+        for contract in self._requested_contracts(contracts):
             # tickerId = self.tickerId(contract.m_symbol)
-            tickerId = self.tickerId(self.contractString(contract))
+            tickerId = self.tickerId(contract)
             self.ibConn.cancelHistoricalData(tickerId=tickerId)
 
     # -----------------------------------------
@@ -2235,12 +2495,13 @@ class ezIBpy():
         """
         leg = ComboLeg()
 
+        # wait (up to 5s) for the contract details to arrive
         loops = 0
-        conId = 0
+        conId = self.getConId(contract)
         while conId == 0 and loops < 100:
+            time.sleep(0.05)
             conId = self.getConId(contract)
             loops += 1
-            time.sleep(0.05)
 
         leg.m_conId = conId
         leg.m_ratio = abs(ratio)
@@ -2263,50 +2524,40 @@ class ezIBpy():
     # -----------------------------------------
     def getStrikes(self, contract_identifier, smin=None, smax=None):
         """ return strikes of contract / "multi" contract's contracts """
-        strikes = []
         contracts = self.contractDetails(contract_identifier)["contracts"]
 
         if contracts[0].m_secType not in ("FOP", "OPT"):
             return []
 
-        # collect expirations
-        for contract in contracts:
-            strikes.append(contract.m_strike)
-
-        # convert to floats
-        strikes = list(map(float, strikes))
-        # strikes = list(set(strikes))
+        # collect strikes (as floats)
+        strikes = np_fromiter((float(contract.m_strike) for contract in contracts),
+                              dtype=float, count=len(contracts))
 
         # get min/max
-        if smin is not None or smax is not None:
-            smin = smin if smin is not None else 0
-            smax = smax if smax is not None else 1000000000
-            srange = list(set(range(smin, smax, 1)))
-            strikes = [n for n in strikes if n in srange]
+        if smin is not None:
+            strikes = strikes[strikes >= smin]
+        if smax is not None:
+            strikes = strikes[strikes <= smax]
 
         strikes.sort()
-        return tuple(strikes)
+        return tuple(strikes.tolist())
 
     # -----------------------------------------
     def getExpirations(self, contract_identifier, expired=0):
         """ return expiration of contract / "multi" contract's contracts """
-        expirations = []
         contracts = self.contractDetails(contract_identifier)["contracts"]
 
         if contracts[0].m_secType not in ("FUT", "FOP", "OPT"):
             return []
 
-        # collect expirations
-        for contract in contracts:
-            expirations.append(contract.m_expiry)
-
-        # convert to ints
-        expirations = list(map(int, expirations))
-        # expirations = list(set(expirations))
+        # collect expirations (as ints, chronologically)
+        expirations = np_fromiter((int(contract.m_expiry) for contract in contracts),
+                                  dtype="int64", count=len(contracts))
+        expirations.sort()
 
         # remove expired contracts
         today = int(datetime.now().strftime("%Y%m%d"))
-        closest = min(expirations, key=lambda x: abs(x - today))
-        expirations = expirations[expirations.index(closest) - expired:]
+        closest = int(np_abs(expirations - today).argmin())
+        expirations = expirations[max(0, closest - expired):]
 
-        return tuple(expirations)
+        return tuple(expirations.tolist())